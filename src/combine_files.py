@@ -10,6 +10,7 @@
     include_patterns:    要包含的文件或目录的路径模式。支持通配符。
     --exclude, -e:       要排除的文件或目录的路径模式。支持通配符。
     --include-hidden:    如果指定，将包含隐藏文件和文件夹 (以"."开头)。
+    --no-sort:           如果指定，按输入参数和目录遍历的顺序合并，不再按路径排序。
 
 使用例子:
     # 将 my_project/ 目录下的所有非隐藏文件合并到 project_source.txt
@@ -23,14 +24,367 @@
 """
 
 import argparse
+import errno
 import glob
+import heapq
+import itertools
 import os
+import re
+import shutil
+import stat
 import sys
 import fnmatch
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# 合并时每次复制的块大小
+_COPY_BUFSIZE = 1 << 20
+# 每次 sendfile 调用最多复制的字节数
+_SENDFILE_CHUNK = 16 << 20
+# 输出文件的写缓冲区大小
+_WRITE_BUFSIZE = 4 << 20
+# 预读线程数，以及最多提前读入内存的文件数 (每个不超过 _COPY_BUFSIZE)
+_READ_WORKERS = 8
+_READ_AHEAD = 16
+# 匹配路径中以 "." 开头的部分 ("." 和 ".." 除外)
+_HIDDEN_RE = re.compile(r'(?:^|{sep})\.(?!\.?(?:{sep}|\Z))'.format(sep=re.escape(os.path.sep)))
+# 用于检查编码是否与 ASCII 兼容
+_ASCII_BYTES = bytes(range(128))
+_ASCII_CHARS = _ASCII_BYTES.decode('ascii')
+# 与 glob 判断通配符的规则一致
+_MAGIC_RE = re.compile('[*?[]')
+
+
+def _compile_exclude_patterns(exclude_patterns):
+    """
+    将排除模式预编译为匹配器，避免在过滤循环中对每个 (文件, 模式) 组合重复调用 fnmatch。
+    Args:
+        exclude_patterns (list): 需要排除的文件或目录模式列表。
+    Returns:
+        tuple: (字面量集合, 通配符正则, 目录前缀元组, 剪枝正则)。不含通配符的模式 (如 ".DS_Store")
+               放入集合直接查找，其余模式合并为一个正则 (没有时为 None)；
+               前缀元组用于 str.startswith 判断目录排除；剪枝正则匹配到的目录，
+               其下所有文件必然被排除，为 None 表示没有可用于剪枝的模式。
+    """
+    # fnmatch.fnmatch 会对两侧做 normcase，这里对模式做一次，匹配时对路径做一次。
+    # 类似 .gitignore 的长列表中常有重复项，去重后再合并，避免正则里出现重复的分支
+    unique_patterns = dict.fromkeys(os.path.normcase(p) for p in exclude_patterns)
+    literal_names = set()
+    glob_patterns = []
+    for pattern in unique_patterns:
+        if '*' in pattern or '?' in pattern or '[' in pattern:
+            glob_patterns.append(pattern)
+        else:
+            literal_names.add(pattern)
+    pattern_re = None
+    if glob_patterns:
+        pattern_re = re.compile('|'.join(
+            f'(?:{fnmatch.translate(p)})' for p in glob_patterns
+        ))
+
+    dir_prefixes = {}
+    for pattern in exclude_patterns:
+        normalized_pattern = os.path.normpath(pattern)
+        # 已存在的目录，或以路径分隔符结尾的模式，均视为目录排除
+        if os.path.isdir(normalized_pattern) or pattern.endswith(os.path.sep) or pattern.endswith('/'):
+            dir_prefixes[normalized_pattern + os.path.sep] = None
+
+    # 形如 "**/build/*" 的模式：fnmatch 的 "*" 可以匹配路径分隔符，
+    # 因此只要目录本身匹配 "**/build"，该目录下的所有文件都会被排除，可以整棵子树跳过
+    prune_patterns = {}
+    for pattern in unique_patterns:
+        stem = pattern.rstrip('*')
+        if stem != pattern and stem.endswith((os.path.sep, '/')) and len(stem) > 1:
+            prune_patterns[stem[:-1]] = None
+    prune_re = None
+    if prune_patterns:
+        prune_re = re.compile('|'.join(
+            f'(?:{fnmatch.translate(p)})' for p in prune_patterns
+        ))
+    return literal_names, pattern_re, tuple(dir_prefixes), prune_re
+
+
+def _plan_inputs(input_paths, include_hidden=False):
+    """
+    去掉会被其他输入目录完整覆盖的输入，避免重复遍历同一棵目录树或重复 glob。
+    Args:
+        input_paths (list): 输入文件、目录或通配符模式的列表。
+        include_hidden (bool): 如果为True，则包含隐藏文件和目录。
+    Returns:
+        tuple: (需要处理的输入列表, 延后判断的 (通配符模式, 覆盖它的目录) 列表)。
+    """
+    # 路径均经 realpath 解析后比较
+    def covering_dir(real, dirs):
+        for d in dirs:
+            prefix = os.path.join(d, '')
+            # 不包含隐藏文件时，遍历外层目录不会进入隐藏目录，相对路径含隐藏部分的不算被覆盖
+            if real == d or (real.startswith(prefix)
+                             and (include_hidden or not _HIDDEN_RE.search(real[len(prefix):]))):
+                return d
+        return None
+
+    dir_inputs = {}
+    for path in input_paths:
+        if os.path.isdir(path):
+            # 同一目录只保留第一次出现的输入
+            dir_inputs.setdefault(os.path.realpath(path), path)
+    # 实际会遍历的目录：不位于其他输入目录之内的那些
+    walked_dirs = [d for d in dir_inputs if covering_dir(d, [o for o in dir_inputs if o != d]) is None]
+    walked_inputs = {dir_inputs[d] for d in walked_dirs}
+
+    to_process, deferred = [], []
+    for path in input_paths:
+        if os.path.isdir(path):
+            if path in walked_inputs:
+                walked_inputs.discard(path)
+                to_process.append(path)
+            continue
+
+        parts = path.replace(os.path.altsep, os.path.sep).split(os.path.sep) if os.path.altsep \
+            else path.split(os.path.sep)
+        magic_index = next((i for i, part in enumerate(parts) if _MAGIC_RE.search(part)), None)
+        covered_by = None
+        if magic_index is None:
+            # 不含通配符的路径：只有确实存在的文件才可能被目录遍历覆盖
+            if os.path.isfile(path):
+                covered_by = covering_dir(os.path.realpath(path), walked_dirs)
+        # 通配符之后出现 ".." 时，匹配结果可能跑出前缀目录，不做判断
+        elif os.path.pardir not in parts[magic_index:]:
+            prefix = os.path.sep.join(parts[:magic_index]) or (os.path.sep if magic_index else os.path.curdir)
+            covered_by = covering_dir(os.path.realpath(prefix), walked_dirs)
+
+        if covered_by is None:
+            to_process.append(path)
+        # 单层通配符直接去掉；跨多层的 (如 "src/**/*.py") 会经过目录符号链接而遍历不会，由调用方在遍历后决定
+        elif magic_index is not None and (magic_index < len(parts) - 1 or parts[-1] == '**'):
+            deferred.append((path, covered_by))
+    return to_process, deferred
+
+
+def _walk_dir(path, include_hidden=False, prune_re=None, prune_prefixes=(), symlink_dirs=None):
+    """
+    基于 os.scandir 的显式栈遍历，行为与 os.walk(path) 一致，产出的路径按路径字符串升序。
+    Args:
+        path (str): 要遍历的目录。
+        include_hidden (bool): 如果为True，则包含隐藏文件和目录。
+        prune_re (re.Pattern): 匹配到的子目录整棵跳过，参见 _compile_exclude_patterns。
+        prune_prefixes (tuple): 目录排除前缀，落在其中的子目录整棵跳过。
+        symlink_dirs (list): 如果提供，跳过的目录符号链接会追加到该列表中。
+    Yields:
+        str: 目录下每个非目录条目的路径，按路径字符串升序。
+    """
+    # 栈中元素为 (路径, 是否为目录)
+    stack = [(path, True)]
+    while stack:
+        entry_path, is_dir = stack.pop()
+        if not is_dir:
+            yield entry_path
+            continue
+        # 与 os.walk 相同，忽略无法读取的目录
+        try:
+            it = os.scandir(entry_path)
+        except OSError:
+            continue
+        children = []
+        with it:
+            for entry in it:
+                # 默认情况下，排除隐藏文件和文件夹
+                if not include_hidden and entry.name.startswith('.'):
+                    continue
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    # 与 os.walk 相同：指向目录的符号链接既不进入，也不作为文件
+                    if entry.is_symlink():
+                        if symlink_dirs is not None:
+                            symlink_dirs.append(entry.path)
+                        continue
+                    # 整个子目录都会被排除时，不再进入该目录
+                    if prune_re is not None and prune_re.match(os.path.normcase(entry.path)):
+                        continue
+                    if prune_prefixes and (os.path.normpath(entry.path) + os.path.sep).startswith(prune_prefixes):
+                        continue
+                    # 子目录按 "名称 + 分隔符" 排序，使产出顺序与对完整路径字符串排序相同
+                    children.append((entry.name + os.path.sep, entry.path, True))
+                else:
+                    children.append((entry.name, entry.path, False))
+        # 逆序入栈，出栈时即为升序
+        children.sort(reverse=True)
+        stack.extend((child_path, child_is_dir) for _, child_path, child_is_dir in children)
+
+
+def _read_small_file(filepath):
+    """
+    用 os.read 直接读出不超过 _COPY_BUFSIZE 的普通文件的全部内容，供预读线程调用。
+    Args:
+        filepath (str): 要读取的文件路径。
+    Returns:
+        bytes: 文件内容。如果文件较大、不是普通文件或读取时仍在增长，返回 None，
+               由 _copy_file 分块复制。
+    """
+    fd = os.open(filepath, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        st = os.fstat(fd)
+        if not stat.S_ISREG(st.st_mode) or st.st_size > _COPY_BUFSIZE:
+            return None
+        # 多读 1 个字节，用于确认已经读到文件末尾。单次 read 在 FUSE、NFS 等文件系统上可能返回不足，
+        # 因此循环读到 EOF 或超出 st_size 为止
+        chunks = []
+        remaining = st.st_size + 1
+        while remaining > 0:
+            chunk = os.read(fd, remaining)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b''.join(chunks) if remaining > 0 else None
+    finally:
+        os.close(fd)
+
+
+def _fadvise(fd, advice_name):
+    """
+    在支持 posix_fadvise 的系统上，向内核提示整个文件的访问方式；不支持或失败时静默忽略。
+    Args:
+        fd (int): 文件描述符。
+        advice_name (str): os 模块中的常量名，如 'POSIX_FADV_SEQUENTIAL'。
+    """
+    advice = getattr(os, advice_name, None)
+    if advice is not None:
+        try:
+            os.posix_fadvise(fd, 0, 0, advice)
+        except OSError:
+            pass
+
+
+def _sendfile_copy(in_fd, out_fd):
+    """
+    用 os.sendfile 在内核中把 in_fd 的内容复制到 out_fd 的当前位置，不经过用户态缓冲区。
+    Args:
+        in_fd (int): 输入文件描述符。
+        out_fd (int): 输出文件描述符。
+    Returns:
+        bool: 复制完成返回 True；系统不支持向普通文件 sendfile 时 (如 macOS) 返回 False，此时尚未复制任何数据。
+    """
+    offset = 0
+    while True:
+        try:
+            n = os.sendfile(out_fd, in_fd, offset, _SENDFILE_CHUNK)
+        except OSError as e:
+            if offset == 0 and e.errno in (errno.EINVAL, errno.ENOSYS, errno.ENOTSOCK, errno.EOPNOTSUPP):
+                return False
+            raise
+        if n == 0:
+            return True
+        offset += n
+
+
+def _copy_file(filepath, outfile):
+    """
+    将单个文件的内容按原始字节追加到 outfile，输入和输出都是普通文件时用 sendfile 在内核中复制。
+    Args:
+        filepath (str): 要读取的文件路径。
+        outfile: 以二进制方式打开的输出文件对象。
+    """
+    with open(filepath, 'rb') as infile:
+        in_fd, out_fd = infile.fileno(), outfile.fileno()
+        in_st, out_st = os.fstat(in_fd), os.fstat(out_fd)
+        # 输出文件本身也是输入时，只复制打开时的大小，否则会一直读到自己刚写出的数据
+        if os.path.samestat(in_st, out_st):
+            outfile.write(infile.read(in_st.st_size))
+            return
+        # 提示内核顺序读取以加大预读；读完后释放页缓存，避免大文件挤占缓存
+        _fadvise(in_fd, 'POSIX_FADV_SEQUENTIAL')
+        try:
+            if hasattr(os, 'sendfile') and stat.S_ISREG(in_st.st_mode) and stat.S_ISREG(out_st.st_mode):
+                # 先把已缓冲的文件头写出，保证内核写入的顺序正确
+                outfile.flush()
+                if _sendfile_copy(in_fd, out_fd):
+                    return
+            shutil.copyfileobj(infile, outfile, _COPY_BUFSIZE)
+        finally:
+            _fadvise(in_fd, 'POSIX_FADV_DONTNEED')
+
+
+def _collect_candidates(input_paths, include_hidden=False, sort=True, prune_re=None, prune_prefixes=(),
+                        dedup_inputs=True):
+    """
+    查找所有输入对应的候选文件：目录递归遍历，文件和通配符模式使用 glob。
+    Args:
+        input_paths (list): 输入文件、目录或通配符模式的列表。
+        include_hidden (bool): 如果为True，则包含隐藏文件和目录。
+        sort (bool): 如果为True，返回按路径排序的列表；否则保持发现文件的顺序。
+        prune_re (re.Pattern): 遍历目录时整棵跳过的子目录，参见 _walk_dir。
+        prune_prefixes (tuple): 遍历目录时整棵跳过的目录前缀，参见 _walk_dir。
+        dedup_inputs (bool): 如果为True，跳过已被其他输入目录覆盖的输入，参见 _plan_inputs。
+    Returns:
+        list: 去重后的候选文件路径。
+    """
+    # 每个输入产生一个有序的路径列表，最后归并
+    runs = []
+    # 多个通配符模式可能匹配到相同的路径，缓存 isfile 结果以避免重复 stat
+    stat_cache = {}
+
+    def _isfile(p):
+        is_file = stat_cache.get(p)
+        if is_file is None:
+            try:
+                is_file = stat.S_ISREG(os.stat(p).st_mode)
+            except (OSError, ValueError):
+                is_file = False
+            stat_cache[p] = is_file
+        return is_file
+
+    def add_glob_matches(path):
+        matched_files = glob.glob(path, recursive=True)
+        if not matched_files and '*' not in path and '?' not in path:
+            print(f"警告：路径 '{path}' 没有匹配到任何文件或目录。")
+
+        run = []
+        for f_path in matched_files:
+            if _isfile(f_path):
+                # 如果不包含隐藏文件，且路径的任何部分以 '.' 开头，则跳过
+                if not include_hidden and _HIDDEN_RE.search(f_path):
+                    continue
+                run.append(f_path)
+        run.sort()
+        runs.append(run)
+
+    # 已被其他输入目录覆盖的输入不再重复处理
+    if dedup_inputs:
+        paths_to_scan, deferred_patterns = _plan_inputs(input_paths, include_hidden)
+    else:
+        paths_to_scan, deferred_patterns = input_paths, []
+    # 遍历时遇到过目录符号链接的输入目录 (realpath)
+    dirs_with_symlinks = set()
+    for path in paths_to_scan:
+        # 如果路径是一个目录，则递归遍历
+        if os.path.isdir(path):
+            symlink_dirs = []
+            runs.append(list(_walk_dir(path, include_hidden, prune_re, prune_prefixes, symlink_dirs)))
+            if symlink_dirs:
+                dirs_with_symlinks.add(os.path.realpath(path))
+        # 如果是文件或通配符模式，使用 glob
+        else:
+            add_glob_matches(path)
+    # 跨多层的通配符会进入目录符号链接，只有目录遍历中确实没有符号链接时才能跳过
+    for path, covered_by in deferred_patterns:
+        if covered_by in dirs_with_symlinks:
+            add_glob_matches(path)
+
+    if sort:
+        # 各列表已经有序，用 heapq.merge 归并代替整体排序，重复路径归并后相邻，一并去掉
+        candidate_files = [f for f, _ in itertools.groupby(heapq.merge(*runs))]
+    else:
+        # 用 dict 去重，同时保留发现文件的顺序
+        candidate_files = list(dict.fromkeys(itertools.chain.from_iterable(runs)))
+    return candidate_files
 
 
 def combine_files(output_file, input_paths, exclude_patterns=None, use_absolute_paths=False, encoding='utf-8',
-                  include_hidden=False):
+                  include_hidden=False, sort=True):
     """
     将多个输入文件/目录中的文件合并到一个输出文件中，同时支持排除特定模式和隐藏文件。
     Args:
@@ -38,100 +392,115 @@ def combine_files(output_file, input_paths, exclude_patterns=None, use_absolute_
         input_paths (list): 输入文件、目录或通配符模式的列表。
         exclude_patterns (list): 需要排除的文件或目录模式列表。
         use_absolute_paths (bool): 如果为True，则在标题中使用绝对路径。
-        encoding (str): 读写文件时使用的编码。
+        encoding (str): 读取输入文件和写入输出文件使用的编码。与 ASCII 兼容的编码 (如 utf-8、gbk)
+                        按原始字节复制文件内容；utf-16 等其他编码按文本方式逐个解码后再编码写出。
         include_hidden (bool): 如果为True，则包含隐藏文件和目录。
+        sort (bool): 如果为True，则按路径排序后合并；否则保持发现文件的顺序。
     """
     if exclude_patterns is None:
         exclude_patterns = []
+    literal_names, pattern_re, dir_prefixes, prune_re = set(), None, (), None
+    if exclude_patterns:
+        literal_names, pattern_re, dir_prefixes, prune_re = _compile_exclude_patterns(exclude_patterns)
 
     # 步骤 1: 查找所有候选文件
-    candidate_files = set()
-    for path in input_paths:
-        # 如果路径是一个目录，则递归遍历
-        if os.path.isdir(path):
-            for dirpath, dirnames, filenames in os.walk(path, topdown=True):
-                # 默认情况下，排除隐藏文件和文件夹
-                if not include_hidden:
-                    # 从 dirnames 列表中移除隐藏目录，以阻止 os.walk 进入这些目录
-                    dirnames[:] = [d for d in dirnames if not d.startswith('.')]
-                    # 从 filenames 列表中筛选掉隐藏文件
-                    filenames = [f for f in filenames if not f.startswith('.')]
-
-                for filename in filenames:
-                    full_path = os.path.join(dirpath, filename)
-                    candidate_files.add(full_path)
-        # 如果是文件或通配符模式，使用 glob
-        else:
-            matched_files = glob.glob(path, recursive=True)
-            if not matched_files and '*' not in path and '?' not in path:
-                print(f"警告：路径 '{path}' 没有匹配到任何文件或目录。")
-
-            for f_path in matched_files:
-                if os.path.isfile(f_path):
-                    # 如果不包含隐藏文件，检查路径的任何部分是否是隐藏的
-                    if not include_hidden:
-                        # 如果路径的任何部分以 '.' 开头，则跳过
-                        if any(p.startswith('.') and p not in ('.', '..') for p in f_path.split(os.path.sep)):
-                            continue
-                    candidate_files.add(f_path)
+    if len(input_paths) == 1 and not exclude_patterns and os.path.isdir(input_paths[0]):
+        # 最常见的情况：单个目录且没有排除模式。遍历结果本身有序且不重复，
+        # 无需规划输入、归并去重和过滤
+        candidate_files = list(_walk_dir(input_paths[0], include_hidden))
+    else:
+        # 排除模式按路径字符串匹配，同一文件换一种写法可能不被排除，因此有排除模式时不跳过被覆盖的输入
+        candidate_files = _collect_candidates(input_paths, include_hidden, sort, prune_re, dir_prefixes,
+                                              dedup_inputs=not exclude_patterns)
 
     # 步骤 2: 根据排除模式过滤文件
     if exclude_patterns:
         files_to_process = []
         for f in candidate_files:
-            is_excluded = False
-            normalized_f = os.path.normpath(f)
-            for pattern in exclude_patterns:
-                normalized_pattern = os.path.normpath(pattern)
-                # fnmatch 用于路径与通配符模式的匹配
-                if fnmatch.fnmatch(os.path.basename(f), pattern) or fnmatch.fnmatch(f, pattern):
-                    is_excluded = True
-                    break  # 一旦匹配到一个排除模式，就无需再检查
-                # 检查是否是目录排除
-                if os.path.isdir(normalized_pattern) and normalized_f.startswith(normalized_pattern + os.path.sep):
-                    is_excluded = True
-                    break
-                if (pattern.endswith(os.path.sep) or pattern.endswith('/')) and \
-                   normalized_f.startswith(normalized_pattern + os.path.sep):
-                    is_excluded = True
-                    break
-            if not is_excluded:
-                files_to_process.append(f)
+            normalized_case_f = os.path.normcase(f)
+            base = os.path.basename(normalized_case_f)
+            # 先用集合查找字面量模式，再用正则匹配文件名和完整路径
+            if base in literal_names or normalized_case_f in literal_names:
+                continue
+            if pattern_re is not None and (pattern_re.match(base) or pattern_re.match(normalized_case_f)):
+                continue
+            # 检查是否是目录排除 (模式已在编译时规范化，没有目录排除时也无需规范化文件路径)
+            if dir_prefixes and os.path.normpath(f).startswith(dir_prefixes):
+                continue
+            files_to_process.append(f)
     else:
-        files_to_process = list(candidate_files)
+        files_to_process = candidate_files
 
     # 如果过滤后没有文件，则退出
     if not files_to_process:
         print("错误：经过滤后，没有找到任何要合并的文件。脚本已退出。")
         sys.exit(1)
 
-    # 步骤 3: 排序并合并
-    files_to_process.sort()
-
+    # 步骤 3: 合并
     print(f"找到 {len(candidate_files)} 个文件，排除 {len(candidate_files) - len(files_to_process)} 个后，")
     print(f"准备合并以下 {len(files_to_process)} 个文件到 '{output_file}':")
-    for f in files_to_process:
-        print(f"  - {f}")
+    # 拼接成一个字符串一次写出，避免逐行 print 的开销
+    sys.stdout.write(''.join(f"  - {f}\n" for f in files_to_process))
     print("-" * 20)
 
+    # 只获取一次当前目录，避免 os.path.abspath 对每个文件都调用 getcwd
+    if use_absolute_paths:
+        cwd = os.getcwd()
+        header_paths = [os.path.normpath(os.path.join(cwd, f)) for f in files_to_process]
+    else:
+        header_paths = files_to_process
+
     try:
-        with open(output_file, 'w', encoding=encoding) as outfile:
-            for index, filepath in enumerate(files_to_process):
-                if index > 0:
-                    outfile.write('\n\n')
+        # 文件头与按原始字节复制的内容混写，要求编码把 ASCII 字符编码为相同的单字节且不带 BOM；
+        # 否则退回文本方式，逐个文件解码后再按目标编码写出
+        if _ASCII_CHARS.encode(encoding) != _ASCII_BYTES:
+            with open(output_file, 'w', encoding=encoding) as outfile:
+                for index, (header_path, filepath) in enumerate(zip(header_paths, files_to_process)):
+                    if index > 0:
+                        outfile.write('\n\n')
+                    outfile.write(f"--- {header_path} ---\n")
+
+                    try:
+                        with open(filepath, 'r', encoding=encoding, errors='ignore') as infile:
+                            outfile.write(infile.read())
+                    except Exception as e:
+                        error_message = f"\n错误：读取文件 '{filepath}' 时发生错误: {e}\n"
+                        print(error_message)
+                        outfile.write(error_message)
 
-                header_path = os.path.abspath(filepath) if use_absolute_paths else filepath
-                outfile.write(f"--- {header_path} ---\n")
+            print(f"\n✅ 成功！所有文件已合并到 '{output_file}'。")
+            return
+
+        # 预先编码所有文件头，除第一个外都带上与上一个文件之间的空行
+        headers = [b'\n\n' + f"--- {p} ---\n".encode(encoding, 'replace') for p in header_paths]
+        headers[0] = headers[0][2:]
+
+        # 以二进制方式复制文件内容，复制循环由 shutil 在 C 层完成，不再逐块解码/编码。
+        # 小文件由线程池按顺序提前读入内存，主线程按排序后的顺序依次写出
+        out_fd = os.open(output_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o666)
+        with open(out_fd, 'wb', buffering=_WRITE_BUFSIZE) as outfile, \
+                ThreadPoolExecutor(max_workers=_READ_WORKERS) as pool:
+            def write_entry(header, filepath, future):
+                outfile.write(header)
 
                 try:
-                    with open(filepath, 'r', encoding=encoding, errors='ignore') as infile:
-                        # errors='ignore' 可以跳过无法解码的字符
-                        content = infile.read()
-                        outfile.write(content)
+                    data = future.result()
+                    if data is None:
+                        _copy_file(filepath, outfile)
+                    else:
+                        outfile.write(data)
                 except Exception as e:
                     error_message = f"\n错误：读取文件 '{filepath}' 时发生错误: {e}\n"
                     print(error_message)
-                    outfile.write(error_message)
+                    outfile.write(error_message.encode(encoding, 'replace'))
+
+            pending = deque()
+            for header, filepath in zip(headers, files_to_process):
+                pending.append((header, filepath, pool.submit(_read_small_file, filepath)))
+                if len(pending) >= _READ_AHEAD:
+                    write_entry(*pending.popleft())
+            while pending:
+                write_entry(*pending.popleft())
 
         print(f"\n✅ 成功！所有文件已合并到 '{output_file}'。")
 
@@ -171,6 +540,12 @@ def main():
         action='store_true',
         help='包含隐藏文件和文件夹 (即以 "." 开头的文件和文件夹)。'
     )
+    parser.add_argument(
+        '--no-sort',
+        dest='sort',
+        action='store_false',
+        help='不按路径排序，按输入参数和目录遍历的顺序合并文件。'
+    )
 
     args = parser.parse_args()
     combine_files(
@@ -178,7 +553,8 @@ def main():
         args.input_paths,
         args.exclude,
         args.absolute,
-        include_hidden=args.include_hidden
+        include_hidden=args.include_hidden,
+        sort=args.sort
     )
 
 